@@ -0,0 +1,209 @@
+"""
+Shared DuckDB setup and SQL fragments for the Overture Maps scripts.
+
+import_overture_us.py, export_overture_geojson.py and build_local_cache.py
+all select the same US POIs; keeping the filters here ensures an import, an
+export and the local cache always agree on what "US" means.
+"""
+
+import os
+import sys
+from pathlib import Path
+from typing import Optional
+
+import duckdb
+from dotenv import load_dotenv
+
+# Load .env from parent directory (mapierhub/.env)
+env_path = Path(__file__).parent.parent / ".env"
+load_dotenv(env_path)
+
+# Configuration
+OVERTURE_VERSION = "2025-11-19.0"
+OVERTURE_PATH = f"s3://overturemaps-us-west-2/release/{OVERTURE_VERSION}/theme=places/*/*"
+
+# Optional local cache built by build_local_cache.py
+LOCAL_DUCKDB = os.environ.get("MAPIER_LOCAL_DUCKDB")
+
+# DuckDB threads for S3 scans; more than cores since most of them wait on the network
+S3_THREADS = 2 * (os.cpu_count() or 4)
+
+# Continental US + Alaska + Hawaii as (xmin, ymin, xmax, ymax)
+US_BBOX = (-180, 18, -65, 72)
+
+# Scalar POI attributes selected by both the importer and the exporter
+PROJECTION_COLUMNS = [
+    "id",
+    "names.primary AS name",
+    "confidence",
+    "categories.primary AS primary_category",
+    "brand.names.primary AS brand",
+    "operating_status",
+    "addresses[1].freeform AS street",
+    "addresses[1].locality AS city",
+    "addresses[1].region AS state",
+    "addresses[1].postcode AS postcode",
+    "addresses[1].country AS country",
+]
+
+# List attributes by output name; empty lists are stored as NULL, so they're
+# nulled here rather than per row
+LIST_COLUMNS = {
+    name: f"CASE WHEN len({expr}) > 0 THEN {expr} END"
+    for name, expr in [
+        ("alternate_categories", "categories.alternate"),
+        ("websites", "websites"),
+        ("socials", "socials"),
+        ("phones", "phones"),
+        ("emails", "emails"),
+    ]
+}
+
+
+def load_extensions(con: duckdb.DuckDBPyConnection, *names: str) -> None:
+    """LOAD DuckDB extensions, installing them only on first use."""
+    for name in names:
+        try:
+            con.execute(f"LOAD {name};")
+        except duckdb.IOException:
+            con.execute(f"INSTALL {name}; LOAD {name};")
+
+
+def check_cache_version(con: duckdb.DuckDBPyConnection, path: str) -> None:
+    """Exit unless the local cache was built from OVERTURE_VERSION."""
+    try:
+        row = con.execute("SELECT overture_version FROM cache_meta").fetchone()
+    except duckdb.CatalogException:
+        row = None
+    cached_version = row[0] if row else None
+
+    # Rows read from the cache are stamped with OVERTURE_VERSION, so a stale
+    # cache would import the old release under the new release's label
+    if cached_version != OVERTURE_VERSION:
+        built_from = f"Overture {cached_version}" if cached_version else "an unknown Overture release"
+        print(f"Error: {path} was built from {built_from}, expected {OVERTURE_VERSION}; "
+              "rebuild it with build_local_cache.py")
+        sys.exit(1)
+
+
+def setup_duckdb(
+    path: Optional[str] = None,
+    read_only: bool = False,
+    workers: int = 1,
+    scan_s3: Optional[bool] = None
+):
+    """Open the database at `path` (or an in-memory one) ready to scan Overture.
+
+    `scan_s3` says whether queries read the release from S3; by default only
+    an in-memory database does, while `path` is the local cache. `workers`
+    is the number of processes sharing the machine; each gets that share of
+    the threads and of DuckDB's default memory limit.
+    """
+    if scan_s3 is None:
+        scan_s3 = path is None
+
+    con = duckdb.connect(path, read_only=read_only) if path else duckdb.connect()
+    if path and not scan_s3:
+        check_cache_version(con, path)
+    load_extensions(con, "spatial", "httpfs")
+    con.execute("SET s3_region='us-west-2';")
+    # S3 scans are latency-bound: keep connections alive, retry transient
+    # errors, and run more scan threads than cores to keep requests in flight
+    con.execute("SET http_keep_alive=true; SET http_retries=8;")
+    if scan_s3:
+        con.execute(f"SET threads={max(1, S3_THREADS // workers)};")
+    elif workers > 1:
+        # Local scans are CPU-bound, so the cores are shared out instead
+        con.execute(f"SET threads={max(1, (os.cpu_count() or 4) // workers)};")
+    if workers > 1:
+        # DuckDB defaults to 80% of RAM per process, which N workers would oversubscribe
+        total_memory = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+        con.execute(f"SET memory_limit='{int(total_memory * 0.8 / workers) // 2**20}MB';")
+    # Keep Parquet footers and HTTP metadata cached between scans of the same files
+    con.execute("SET enable_http_metadata_cache=true; SET parquet_metadata_cache=true;")
+    return con
+
+
+def parquet_source(files: Optional[list] = None, local: bool = False) -> str:
+    """Return the relation to query: the local cache, the whole release, or a subset of its files."""
+    if local:
+        return "places"
+    if files is None:
+        return f"read_parquet('{OVERTURE_PATH}')"
+    return "read_parquet([" + ", ".join(f"'{path}'" for path in files) + "])"
+
+
+def build_where(
+    bbox: tuple = US_BBOX,
+    country: Optional[str] = "US",
+    category: Optional[str] = None,
+    state: Optional[str] = None,
+    min_confidence: Optional[float] = None,
+    min_update: Optional[str] = None
+) -> tuple:
+    """Build the WHERE clause selecting POIs.
+
+    `min_update` is an ISO date; a POI passes if any of its sources was
+    updated on or after it. Returns (sql, params); user-supplied filters are
+    bound as `?` parameters.
+    """
+    xmin, ymin, xmax, ymax = bbox
+
+    where_clauses = [
+        # Overture's bbox struct carries row-group min/max stats, so this
+        # coarse test lets DuckDB skip row groups before decoding geometry
+        f"bbox.xmin <= {xmax} AND bbox.xmax >= {xmin}",
+        f"bbox.ymin <= {ymax} AND bbox.ymax >= {ymin}",
+        # The envelope test runs on the geometry's cached bounding box
+        f"ST_Intersects(geometry, ST_MakeEnvelope({xmin}, {ymin}, {xmax}, {ymax}))"
+    ]
+
+    params = []
+
+    if country:
+        where_clauses.append("addresses[1].country = ?")
+        params.append(country)
+
+    if category:
+        where_clauses.append("categories.primary = ?")
+        params.append(category)
+
+    if state:
+        where_clauses.append("addresses[1].region = ?")
+        params.append(state)
+
+    if min_confidence is not None:
+        where_clauses.append("confidence >= ?")
+        params.append(min_confidence)
+
+    if min_update:
+        # update_time is an ISO 8601 string, so string order is time order
+        where_clauses.append("list_max(list_transform(sources, lambda s: s.update_time)) >= ?")
+        params.append(min_update)
+
+    return " AND ".join(where_clauses), params
+
+
+def build_select(
+    projection: str,
+    limit: Optional[int] = None,
+    files: Optional[list] = None,
+    **filters
+) -> tuple:
+    """SELECT `projection` from the local cache or the release, filtered by build_where(**filters).
+
+    Returns (sql, params) with the LIMIT, if any, bound last.
+    """
+    where_clause, params = build_where(**filters)
+
+    query = f"""
+    SELECT {projection}
+    FROM {parquet_source(files, local=bool(LOCAL_DUCKDB))}
+    WHERE {where_clause}
+    """
+
+    if limit:
+        query += " LIMIT ?"
+        params.append(limit)
+
+    return query, params
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Materialize the US subset of Overture places into a local DuckDB file.
+
+Scanning the release on S3 is the slow part of every import and export. Run
+this once per Overture release, then point the other scripts at the file:
+
+    MAPIER_LOCAL_DUCKDB=overture_us.duckdb python import_overture_us.py
+
+The cached `places` table keeps Overture's schema, so the same queries run
+against it unchanged (with `FROM places` instead of `read_parquet(...)`).
+The release it was built from is kept in `cache_meta`, and the other scripts
+refuse a cache that doesn't match their OVERTURE_VERSION.
+
+Usage:
+    python build_local_cache.py
+
+Options:
+    --output FILE   DuckDB database to write (default: overture_us.duckdb)
+"""
+
+import argparse
+import time
+
+import duckdb
+
+from _overture_sql import OVERTURE_VERSION, build_where, parquet_source, setup_duckdb
+
+# Configuration
+DEFAULT_OUTPUT = "overture_us.duckdb"
+
+
+def build_cache(con: duckdb.DuckDBPyConnection) -> int:
+    """Replace the `places` table with the release's US POIs and return its row count."""
+
+    where_clause, params = build_where()
+
+    # Swap the POIs and the release they came from together
+    con.execute("BEGIN")
+    con.execute(f"""
+    CREATE OR REPLACE TABLE places AS
+    SELECT * FROM {parquet_source()}
+    WHERE {where_clause}
+    """, params)
+    con.execute("CREATE OR REPLACE TABLE cache_meta AS SELECT ? AS overture_version", [OVERTURE_VERSION])
+    con.execute("COMMIT")
+
+    result = con.execute("SELECT COUNT(*) FROM places").fetchone()
+    return result[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cache US Overture POIs in a local DuckDB file")
+    parser.add_argument("--output", "-o", type=str, default=DEFAULT_OUTPUT, help="DuckDB database file")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Overture Maps US POI Cache")
+    print(f"Version: {OVERTURE_VERSION}")
+    print("=" * 60)
+
+    # Writes to the cache file, but reads the release from S3
+    con = setup_duckdb(args.output, scan_s3=True)
+
+    print(f"\nCaching US POIs into {args.output} (this may take a while)...")
+    started = time.time()
+    total = build_cache(con)
+    con.close()
+
+    print(f"\nCached {total:,} POIs in {time.time() - started:.0f}s")
+    print(f"Use it with: MAPIER_LOCAL_DUCKDB={args.output}")
+
+    print(f"\n{'=' * 60}")
+    print("Done!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Export US POIs from Overture Maps to a GeoJSON file.
+
+The file is written by DuckDB's spatial extension (GDAL GeoJSON or
+GeoJSONSeq driver), so rows never pass through Python. GeoJSONSeq writes one
+feature per line, which downstream tools can stream instead of parsing a
+whole FeatureCollection.
+
+Usage:
+    python export_overture_geojson.py
+
+Options:
+    --output FILE   Output path (default: overture_us.geojson or overture_us.geojsonl)
+    --format FMT    geojson (FeatureCollection) or geojsonseq (one feature per line)
+    --limit N       Only export N records
+    --category CAT  Only export specific category (e.g., 'restaurant')
+    --state ST      Only export specific state (e.g., 'CA')
+
+Set MAPIER_LOCAL_DUCKDB to a cache built by build_local_cache.py to read
+from it instead of S3.
+"""
+
+import argparse
+from typing import Optional
+
+import duckdb
+
+from _overture_sql import (
+    LIST_COLUMNS,
+    LOCAL_DUCKDB,
+    OVERTURE_VERSION,
+    PROJECTION_COLUMNS,
+    build_select,
+    setup_duckdb,
+)
+
+# Configuration
+DEFAULT_OUTPUT = "overture_us"
+
+# --format choice -> (file extension, GDAL driver, COPY options)
+FORMATS = {
+    "geojson": (".geojson", "GeoJSON", "LAYER_CREATION_OPTIONS 'WRITE_BBOX=YES'"),
+    "geojsonseq": (".geojsonl", "GeoJSONSeq", None),
+}
+
+
+def build_query(
+    limit: Optional[int] = None,
+    category: Optional[str] = None,
+    state: Optional[str] = None
+) -> tuple:
+    """Build the DuckDB query projecting geometry plus feature properties, as (sql, params)."""
+    # GDAL only writes scalar fields, so list columns become JSON array strings
+    lists = [f"to_json({expr})::VARCHAR AS {name}" for name, expr in LIST_COLUMNS.items()]
+    projection = ", ".join(PROJECTION_COLUMNS + lists + ["geometry"])
+    return build_select(projection, limit=limit, category=category, state=state)
+
+
+def export_to_geojson(
+    con: duckdb.DuckDBPyConnection,
+    query: str,
+    params: list,
+    output_file: str,
+    output_format: str = "geojson"
+) -> int:
+    """Write the query result in `output_format` and return the feature count."""
+    output = output_file.replace("'", "''")
+    _, driver, options = FORMATS[output_format]
+    copy_options = f"FORMAT GDAL, DRIVER '{driver}'" + (f", {options}" if options else "")
+
+    # COPY reports the number of rows written
+    result = con.execute(f"""
+    COPY ({query}) TO '{output}'
+    WITH ({copy_options})
+    """, params).fetchone()
+    return result[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export US POIs from Overture Maps to GeoJSON")
+    parser.add_argument("--output", "-o", type=str, help="Output GeoJSON file")
+    parser.add_argument("--format", choices=FORMATS, default="geojson",
+                        help="geojson writes a FeatureCollection, geojsonseq one feature per line")
+    parser.add_argument("--limit", type=int, help="Limit number of records to export")
+    parser.add_argument("--category", type=str, help="Filter by category (e.g., 'restaurant')")
+    parser.add_argument("--state", type=str, help="Filter by state (e.g., 'CA')")
+    args = parser.parse_args()
+
+    if not args.output:
+        args.output = DEFAULT_OUTPUT + FORMATS[args.format][0]
+
+    print("=" * 60)
+    print("Overture Maps US POI Exporter")
+    print(f"Version: {OVERTURE_VERSION}")
+    if LOCAL_DUCKDB:
+        print(f"Source: {LOCAL_DUCKDB}")
+    print("=" * 60)
+
+    if args.category:
+        print(f"  Filtered by category: {args.category}")
+    if args.state:
+        print(f"  Filtered by state: {args.state}")
+
+    print("\nSetting up DuckDB...")
+    con = setup_duckdb(LOCAL_DUCKDB, read_only=True)
+
+    query, params = build_query(
+        limit=args.limit,
+        category=args.category,
+        state=args.state
+    )
+
+    print(f"Exporting to {args.output} (this may take a few minutes)...")
+    total = export_to_geojson(con, query, params, args.output, args.format)
+    print(f"\nExported {total:,} POIs")
+
+    # Preview a handful of rows with a separate small query
+    print("\nSample POIs:")
+    sample_query, sample_params = build_query(limit=5, category=args.category, state=args.state)
+    samples = con.execute(f"""
+    SELECT name, primary_category, city, state
+    FROM ({sample_query})
+    """, sample_params).fetchall()
+    for name, category, city, state in samples:
+        print(f"  - {name} ({category}) - {city}, {state}")
+
+    print(f"\n{'=' * 60}")
+    print("Done!")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,14 +5,23 @@ Import US POIs from Overture Maps into Supabase.
 - If a POI doesn't exist: INSERT it
 - If a POI exists: UPDATE it (upsert)
 
+Rows are streamed into a temporary staging table with COPY and merged into
+`places` with a single INSERT ... ON CONFLICT per batch. Requires a direct
+Postgres connection string in SUPABASE_DB_URL.
+
 Usage:
     python import_overture_us.py
 
+Set MAPIER_LOCAL_DUCKDB to a cache built by build_local_cache.py to read
+from it instead of S3.
+
 Options:
     --limit N       Only import N records (for testing)
     --category CAT  Only import specific category (e.g., 'restaurant')
     --state ST      Only import specific state (e.g., 'CA')
     --dry-run       Just count records, don't import
+    --direct        Upsert from DuckDB through its postgres extension (no Python rows)
+    --workers N     Import Parquet files in N parallel processes
     --yes           Skip confirmation prompt
 
 Future: For incremental updates using GERS changelog, see:
@@ -21,151 +30,392 @@ https://docs.overturemaps.org/gers/changelog/
 
 import os
 import sys
-import json
 import argparse
-from datetime import datetime
-from pathlib import Path
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 import duckdb
-from dotenv import load_dotenv
-from supabase import create_client
+import psycopg
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
 from tqdm import tqdm
 
-# Load .env from parent directory (mapierhub/.env)
-env_path = Path(__file__).parent.parent / ".env"
-load_dotenv(env_path)
+# Importing _overture_sql also loads .env (SUPABASE_DB_URL, MAPIER_LOCAL_DUCKDB)
+from _overture_sql import (
+    LIST_COLUMNS,
+    LOCAL_DUCKDB,
+    OVERTURE_PATH,
+    OVERTURE_VERSION,
+    PROJECTION_COLUMNS,
+    US_BBOX,
+    build_select,
+    load_extensions,
+    setup_duckdb,
+)
 
 # Configuration
-OVERTURE_VERSION = "2025-11-19.0"
-OVERTURE_PATH = f"s3://overturemaps-us-west-2/release/{OVERTURE_VERSION}/theme=places/*/*"
-BATCH_SIZE = 500
+BATCH_SIZE = 5000
+COMMIT_EVERY = 20  # batches per transaction
+
+# Columns written to places, in COPY order
+PLACE_COLUMNS = [
+    'id', 'name', 'confidence', 'primary_category', 'alternate_categories',
+    'brand', 'operating_status', 'websites', 'socials', 'phones', 'emails',
+    'street', 'city', 'state', 'postcode', 'country', 'lon', 'lat', 'raw',
+    'overture_version'
+]
+# Stamped with now() by Postgres during the merge instead of shipped per row
+TIMESTAMP_COLUMNS = ['overture_updated_at', 'updated_at']
+ARRAY_COLUMNS = list(LIST_COLUMNS)
+
+# Unlogged table used by --direct, where DuckDB writes over its own connections
+DIRECT_STAGE_TABLE = "places_import_stage"
+
+# Failures a bad row can cause (malformed values, constraint violations, an id
+# repeated within a batch); anything else aborts the import instead of bisecting
+ROW_ERRORS = (psycopg.DataError, psycopg.IntegrityError, psycopg.errors.CardinalityViolation)
+
+
+def upsert_sql(stage_table: str) -> str:
+    """Build the statement merging a staging table into places."""
+    columns = ', '.join(PLACE_COLUMNS + TIMESTAMP_COLUMNS)
+    values = ', '.join(PLACE_COLUMNS + ['now()'] * len(TIMESTAMP_COLUMNS))
+    updates = ', '.join(f"{col} = EXCLUDED.{col}" for col in PLACE_COLUMNS + TIMESTAMP_COLUMNS if col != 'id')
+    return f"""
+    INSERT INTO places ({columns})
+    SELECT {values} FROM {stage_table}
+    ON CONFLICT (id) DO UPDATE SET {updates}
+    """
 
 
-def get_supabase_client():
-    url = os.environ.get("SUPABASE_URL")
-    key = os.environ.get("SUPABASE_SERVICE_KEY")
+COPY_TO_STAGE = f"COPY places_stage ({', '.join(PLACE_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+# Arrow quotes every string, so unquoted empty fields are NULLs and "" is ''
+CSV_OPTIONS = pacsv.WriteOptions(include_header=False)
+UPSERT_FROM_STAGE = upsert_sql("places_stage")
 
-    if not url or not key:
-        print("Error: SUPABASE_URL and SUPABASE_SERVICE_KEY environment variables required")
+
+def get_db_url() -> str:
+    dsn = os.environ.get("SUPABASE_DB_URL")
+
+    if not dsn:
+        print("Error: SUPABASE_DB_URL environment variable required")
         sys.exit(1)
 
-    return create_client(url, key)
+    return dsn
 
 
-def setup_duckdb():
-    con = duckdb.connect()
-    con.execute("INSTALL spatial; INSTALL httpfs;")
-    con.execute("LOAD spatial; LOAD httpfs;")
-    con.execute("SET s3_region='us-west-2';")
-    return con
+def get_db_connection():
+    return psycopg.connect(get_db_url())
 
 
-def build_query(
-    limit: Optional[int] = None,
-    category: Optional[str] = None,
-    state: Optional[str] = None
-) -> str:
-    """Build the DuckDB query for extracting US POIs."""
-
-    where_clauses = [
-        "addresses[1].country = 'US'",
-        # Filter to continental US + Alaska + Hawaii coordinates
-        "ST_X(geometry) BETWEEN -180 AND -65",
-        "ST_Y(geometry) BETWEEN 18 AND 72"
-    ]
-
-    if category:
-        where_clauses.append(f"categories.primary = '{category}'")
-
-    if state:
-        where_clauses.append(f"addresses[1].region = '{state}'")
-
-    where_clause = " AND ".join(where_clauses)
-
-    query = f"""
-    SELECT
-        id,
-        names.primary AS name,
-        confidence,
-        categories.primary AS primary_category,
-        categories.alternate AS alternate_categories,
-        brand.names.primary AS brand,
-        operating_status,
-        websites,
-        socials,
-        phones,
-        emails,
-        addresses[1].freeform AS street,
-        addresses[1].locality AS city,
-        addresses[1].region AS state,
-        addresses[1].postcode AS postcode,
-        addresses[1].country AS country,
-        ST_X(geometry) AS lon,
-        ST_Y(geometry) AS lat,
-        to_json(struct_pack(
+# Columns extracted per POI; build_query() swaps this for COUNT(*) when counting
+POI_PROJECTION = ",\n        ".join(PROJECTION_COLUMNS + [
+    f"{expr} AS {name}" for name, expr in LIST_COLUMNS.items()
+] + [
+    "ST_X(geometry) AS lon",
+    "ST_Y(geometry) AS lat",
+    """to_json(struct_pack(
             sources := sources,
             bbox := bbox,
             version := version,
             basic_category := basic_category
-        )) AS raw
-    FROM read_parquet('{OVERTURE_PATH}')
-    WHERE {where_clause}
-    """
+        )) AS raw""",
+])
 
-    if limit:
-        query += f" LIMIT {limit}"
 
-    return query
+def list_parquet_files(con: duckdb.DuckDBPyConnection) -> list:
+    """List the Parquet files of the Overture places release."""
+    return [row[0] for row in con.execute(f"SELECT file FROM glob('{OVERTURE_PATH}')").fetchall()]
 
 
-def transform_record(row: tuple, columns: list) -> dict:
-    """Transform a DuckDB row to a Supabase-compatible dict."""
-    record = dict(zip(columns, row))
+def build_query(
+    limit: Optional[int] = None,
+    category: Optional[str] = None,
+    state: Optional[str] = None,
+    files: Optional[list] = None,
+    projection: str = POI_PROJECTION
+) -> tuple:
+    """Build the DuckDB query for extracting US POIs, as (sql, params)."""
+    return build_select(projection, limit=limit, files=files, category=category, state=state)
 
-    # Handle arrays - convert DuckDB arrays to Python lists
-    for arr_field in ['alternate_categories', 'websites', 'socials', 'phones', 'emails']:
-        if record[arr_field]:
-            record[arr_field] = list(record[arr_field])
-        else:
-            record[arr_field] = None
 
-    # Handle JSON
-    if record['raw']:
-        if isinstance(record['raw'], str):
-            record['raw'] = json.loads(record['raw'])
-        elif isinstance(record['raw'], dict):
-            record['raw'] = json.loads(json.dumps(record['raw'], default=str))
+def pg_array(column: pa.ListArray) -> pa.Array:
+    """Render a list<string> column as Postgres text[] literals."""
+    values = pc.replace_substring(column.values, "\\", "\\\\")
+    values = pc.replace_substring(values, '"', '\\"')
+    values = pc.binary_join_element_wise('"', values, '"', "")
+    values = pc.fill_null(values, "NULL")
+
+    literals = pc.binary_join(pa.ListArray.from_arrays(column.offsets, values), ",")
+    literals = pc.binary_join_element_wise("{", literals, "}", "")
+    return pc.if_else(column.is_null(), None, literals)
+
+
+def transform_batch(batch: pa.RecordBatch) -> pa.RecordBatch:
+    """Transform a DuckDB record batch into the places columns, one Arrow column at a time."""
+    columns = {name: batch.column(name) for name in batch.schema.names}
+
+    for arr_field in ARRAY_COLUMNS:
+        columns[arr_field] = pg_array(columns[arr_field])
 
     # Add metadata
-    record['overture_version'] = OVERTURE_VERSION
-    record['overture_updated_at'] = datetime.utcnow().isoformat()
-    record['updated_at'] = datetime.utcnow().isoformat()
+    columns['overture_version'] = pa.repeat(OVERTURE_VERSION, batch.num_rows)
+
+    return pa.RecordBatch.from_arrays([columns[col] for col in PLACE_COLUMNS], names=PLACE_COLUMNS)
+
+
+def create_stage_table(cursor) -> None:
+    """Create the session-local staging table that COPY writes into."""
+    cursor.execute("CREATE TEMP TABLE places_stage (LIKE places INCLUDING DEFAULTS)")
+
+
+def insert_batch_postgres(cursor, batch: pa.RecordBatch) -> None:
+    """COPY a batch into the staging table and upsert it into places.
+
+    Doesn't commit; the caller groups batches into transactions.
+    """
+    buffer = pa.BufferOutputStream()
+    pacsv.write_csv(batch, buffer, write_options=CSV_OPTIONS)
+
+    with cursor.copy(COPY_TO_STAGE) as copy:
+        copy.write(memoryview(buffer.getvalue()))
+
+    # COPY can't run in pipeline mode, but the statements after it can: they
+    # go out together and cost one round-trip instead of one each
+    with cursor.connection.pipeline():
+        cursor.execute(UPSERT_FROM_STAGE)
+        cursor.execute("TRUNCATE places_stage")
+
+
+def insert_isolated(cursor, batch: pa.RecordBatch) -> None:
+    """Insert a batch inside a savepoint, so a failure only undoes this batch."""
+    cursor.execute("SAVEPOINT batch")
+    try:
+        insert_batch_postgres(cursor, batch)
+    except Exception:
+        # ROLLBACK TO keeps the savepoint open; release it so failed attempts
+        # don't pile up subtransactions until the next commit
+        cursor.execute("ROLLBACK TO SAVEPOINT batch")
+        cursor.execute("RELEASE SAVEPOINT batch")
+        raise
+    cursor.execute("RELEASE SAVEPOINT batch")
+
+
+def insert_bisecting(cursor, batch: pa.RecordBatch, error_samples: list) -> tuple:
+    """Insert a batch, halving it on failure until the offending rows are isolated.
+
+    A handful of bad rows costs a few savepoint round-trips per row rather
+    than one per row of the batch. Only ROW_ERRORS are bisected; connection
+    and server failures are re-raised. Returns (imported, errors).
+    """
+    try:
+        insert_isolated(cursor, batch)
+        return batch.num_rows, 0
+    except ROW_ERRORS as e:
+        if cursor.connection.broken:
+            raise
+        if batch.num_rows == 1:
+            if len(error_samples) < 5:
+                error_samples.append(f"Insert error for {batch.column('id')[0]}: {e}")
+            return 0, 1
+
+    half = batch.num_rows // 2
+    imported, errors = insert_bisecting(cursor, batch.slice(0, half), error_samples)
+    more_imported, more_errors = insert_bisecting(cursor, batch.slice(half), error_samples)
+    return imported + more_imported, errors + more_errors
+
+
+def import_direct(con: duckdb.DuckDBPyConnection, query: str, params: list) -> int:
+    """Upsert the query result into places entirely inside DuckDB and Postgres.
+
+    DuckDB writes the rows to an unlogged staging table over the postgres
+    extension (binary COPY under the hood), then a single INSERT ... ON CONFLICT
+    runs server-side. Returns the number of rows staged.
+    """
+    dsn = get_db_url().replace("'", "''")
+    load_extensions(con, "postgres")
+    # Attachments to a read-only DuckDB (the local cache) default to read-only too
+    con.execute(f"ATTACH '{dsn}' AS pg (TYPE POSTGRES, READ_WRITE)")
+
+    def postgres_execute(sql: str) -> None:
+        escaped = sql.replace("'", "''")
+        con.execute(f"CALL postgres_execute('pg', '{escaped}')")
+
+    postgres_execute(
+        f"CREATE UNLOGGED TABLE IF NOT EXISTS {DIRECT_STAGE_TABLE} (LIKE places INCLUDING DEFAULTS)"
+    )
+    postgres_execute(f"TRUNCATE {DIRECT_STAGE_TABLE}")
+    # The table was created behind DuckDB's back; refresh its catalog cache
+    con.execute("CALL pg_clear_cache()")
+
+    result = con.execute(f"""
+    INSERT INTO pg.{DIRECT_STAGE_TABLE} ({', '.join(PLACE_COLUMNS)})
+    SELECT {', '.join(PLACE_COLUMNS[:-1])}, '{OVERTURE_VERSION}'
+    FROM ({query})
+    """, params).fetchone()
+
+    postgres_execute(upsert_sql(DIRECT_STAGE_TABLE))
+    postgres_execute(f"DROP TABLE {DIRECT_STAGE_TABLE}")
+    con.execute("DETACH pg")
+
+    return result[0]
+
+
+def read_batch(reader: pa.RecordBatchReader) -> Optional[pa.RecordBatch]:
+    """Fetch and transform the next batch, or return None once the reader is exhausted."""
+    try:
+        return transform_batch(reader.read_next_batch())
+    except StopIteration:
+        return None
+
+
+def import_batches(
+    db_conn,
+    con: duckdb.DuckDBPyConnection,
+    query: str,
+    params: list,
+    total: Optional[int],
+    progress: bool = True
+):
+    """Stream the query result through COPY in batches.
+
+    One cursor serves the whole import, and batches are committed
+    COMMIT_EVERY at a time rather than each paying for its own WAL flush.
+    The next batch is fetched on a background thread while the current one
+    is written, so DuckDB's scan overlaps with Postgres' COPY.
+
+    Returns (imported, errors, error_samples).
+    """
+    cursor = db_conn.cursor()
+    # Bulk load: a crash loses at most the last uncommitted batches, which a rerun upserts again
+    cursor.execute("SET synchronous_commit = off")
+    create_stage_table(cursor)
+    db_conn.commit()
+
+    # Execute query and stream Arrow record batches
+    result = con.execute(query, params)
+    # to_arrow_reader replaces the deprecated fetch_record_batch in newer DuckDB releases
+    to_reader = getattr(result, "to_arrow_reader", None) or result.fetch_record_batch
+    reader = to_reader(BATCH_SIZE)
+
+    imported = 0
+    errors = 0
+    error_samples = []
+
+    # DuckDB and Arrow release the GIL while fetching, so one thread is enough to prefetch
+    with ThreadPoolExecutor(max_workers=1) as prefetch, \
+            tqdm(total=total, desc="Importing", unit="pois", disable=not progress) as pbar:
+        next_batch = prefetch.submit(read_batch, reader)
+        batch_number = 0
+
+        while True:
+            batch = next_batch.result()
+            if batch is None:
+                break
+            next_batch = prefetch.submit(read_batch, reader)
+            batch_number += 1
+
+            # Upsert batch - inserts new records, updates existing
+            batch_imported, batch_errors = insert_bisecting(cursor, batch, error_samples)
+            imported += batch_imported
+            errors += batch_errors
+
+            if batch_number % COMMIT_EVERY == 0:
+                db_conn.commit()
+
+            pbar.update(batch.num_rows)
+
+    db_conn.commit()
+    cursor.close()
 
-    return record
+    return imported, errors, error_samples
+
+
+def import_shard(shard: tuple):
+    """Import one subset of Parquet files on its own DuckDB and Postgres connections.
+
+    Runs in a worker process: DuckDB caps a single connection's S3 reads at a
+    couple of threads, so separate processes are what scale the scan.
+    """
+    files, category, state, workers = shard
+    con = setup_duckdb(LOCAL_DUCKDB, read_only=True, workers=workers)
+    db_conn = get_db_connection()
+    try:
+        query, params = build_query(category=category, state=state, files=files)
+        return import_batches(db_conn, con, query, params, total=None, progress=False)
+    finally:
+        db_conn.close()
+        con.close()
+
+
+def import_parallel(
+    con: duckdb.DuckDBPyConnection,
+    workers: int,
+    category: Optional[str],
+    state: Optional[str]
+):
+    """Split the release's Parquet files across worker processes.
+
+    Returns (imported, errors, error_samples) summed over all shards.
+    """
+    files = list_parquet_files(con)
+    if not files:
+        print(f"Error: no Parquet files found at {OVERTURE_PATH}")
+        sys.exit(1)
+    workers = min(workers, len(files))
+    shards = [(files[i::workers], category, state, workers) for i in range(workers)]
+
+    imported = 0
+    errors = 0
+    error_samples = []
+
+    # spawn, not fork: DuckDB's connection threads don't survive a fork
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(processes=len(shards)) as pool:
+        with tqdm(total=len(shards), desc="Importing", unit="shards") as pbar:
+            for shard_imported, shard_errors, shard_samples in pool.imap_unordered(import_shard, shards):
+                imported += shard_imported
+                errors += shard_errors
+                error_samples.extend(shard_samples[:5 - len(error_samples)])
+                pbar.update(1)
+
+    return imported, errors, error_samples
 
 
 def count_records(con: duckdb.DuckDBPyConnection, category: Optional[str], state: Optional[str]) -> int:
     """Count total records to import."""
-    where_clauses = [
-        "addresses[1].country = 'US'",
-        "ST_X(geometry) BETWEEN -180 AND -65",
-        "ST_Y(geometry) BETWEEN 18 AND 72"
-    ]
-
-    if category:
-        where_clauses.append(f"categories.primary = '{category}'")
-    if state:
-        where_clauses.append(f"addresses[1].region = '{state}'")
-
-    where_clause = " AND ".join(where_clauses)
-
-    count_query = f"""
-    SELECT COUNT(*) FROM read_parquet('{OVERTURE_PATH}')
-    WHERE {where_clause}
-    """
+    count_query, params = build_query(category=category, state=state, projection="COUNT(*)")
+    result = con.execute(count_query, params).fetchone()
+    return result[0]
+
 
-    result = con.execute(count_query).fetchone()
+def estimate_records(con: duckdb.DuckDBPyConnection) -> int:
+    """Upper bound on US records, read from Parquet footers only.
+
+    Sums the rows of every row group whose bbox min/max statistics overlap the
+    US envelope, so no column data is fetched from S3.
+    """
+    xmin, ymin, xmax, ymax = US_BBOX
+    result = con.execute(f"""
+    WITH row_groups AS (
+        SELECT
+            file_name,
+            row_group_id,
+            any_value(row_group_num_rows) AS num_rows,
+            min(TRY_CAST(stats_min_value AS DOUBLE)) FILTER (WHERE path_in_schema = 'bbox, xmin') AS xmin,
+            max(TRY_CAST(stats_max_value AS DOUBLE)) FILTER (WHERE path_in_schema = 'bbox, xmax') AS xmax,
+            min(TRY_CAST(stats_min_value AS DOUBLE)) FILTER (WHERE path_in_schema = 'bbox, ymin') AS ymin,
+            max(TRY_CAST(stats_max_value AS DOUBLE)) FILTER (WHERE path_in_schema = 'bbox, ymax') AS ymax
+        FROM parquet_metadata('{OVERTURE_PATH}')
+        GROUP BY file_name, row_group_id
+    )
+    SELECT COALESCE(SUM(num_rows), 0) FROM row_groups
+    -- Row groups without bbox stats can't be ruled out, so they count as overlapping
+    WHERE COALESCE(xmin <= {xmax}, true) AND COALESCE(xmax >= {xmin}, true)
+      AND COALESCE(ymin <= {ymax}, true) AND COALESCE(ymax >= {ymin}, true)
+    """).fetchone()
     return result[0]
 
 
@@ -176,25 +426,25 @@ def main():
     parser.add_argument("--state", type=str, help="Filter by state (e.g., 'CA')")
     parser.add_argument("--dry-run", action="store_true", help="Don't actually insert, just show stats")
     parser.add_argument("--yes", "-y", action="store_true", help="Skip confirmation prompt")
+    parser.add_argument("--direct", action="store_true", help="Upsert from DuckDB via its postgres extension")
+    parser.add_argument("--workers", type=int, default=1, help="Number of parallel import processes")
     args = parser.parse_args()
 
+    if args.workers > 1 and (args.limit or args.direct or LOCAL_DUCKDB):
+        print("Error: --workers can't be combined with --limit, --direct or MAPIER_LOCAL_DUCKDB")
+        sys.exit(1)
+
     print("=" * 60)
     print("Overture Maps US POI Importer")
     print(f"Version: {OVERTURE_VERSION}")
+    if LOCAL_DUCKDB:
+        print(f"Source: {LOCAL_DUCKDB}")
     print("=" * 60)
 
     print("\nSetting up connections...")
-    supabase = get_supabase_client()
-    con = setup_duckdb()
-
-    # Count total records
-    print("Counting records to import (this may take a few minutes)...")
-    total = count_records(con, args.category, args.state)
-
-    if args.limit:
-        total = min(total, args.limit)
-
-    print(f"\nRecords to import: {total:,}")
+    # --direct writes through DuckDB, and each worker opens its own connection
+    db_conn = None if args.direct or args.workers > 1 else get_db_connection()
+    con = setup_duckdb(LOCAL_DUCKDB, read_only=True)
 
     if args.category:
         print(f"  Filtered by category: {args.category}")
@@ -202,77 +452,54 @@ def main():
         print(f"  Filtered by state: {args.state}")
 
     if args.dry_run:
+        # Counting is a full scan of its own, so only dry runs pay for it
+        print("Counting records to import (this may take a few minutes)...")
+        total = count_records(con, args.category, args.state)
+
+        if args.limit:
+            total = min(total, args.limit)
+
+        print(f"\nRecords to import: {total:,}")
         print("\n[Dry run] - exiting without import")
         return
 
+    # Without a count the progress bar shows throughput instead of an ETA
+    total = args.limit
+
+    # A footer-only estimate is close enough for an ETA when nothing narrows the scan
+    if total is None and not (args.category or args.state or LOCAL_DUCKDB):
+        print("Estimating records from Parquet metadata...")
+        total = estimate_records(con)
+        print(f"\nRecords to import: up to ~{total:,}")
+
     # Confirm for large imports
-    if total > 10000 and not args.yes:
-        confirm = input(f"\nThis will upsert {total:,} records. Continue? [y/N] ")
+    if (total is None or total > 10000) and not args.yes:
+        records = f"up to {total:,} records" if total else "all matching records"
+        confirm = input(f"\nThis will upsert {records}. Continue? [y/N] ")
         if confirm.lower() != 'y':
             print("Aborted.")
             return
 
-    # Build query
-    query = build_query(
-        limit=args.limit,
-        category=args.category,
-        state=args.state
-    )
-
-    columns = [
-        'id', 'name', 'confidence', 'primary_category', 'alternate_categories',
-        'brand', 'operating_status', 'websites', 'socials', 'phones', 'emails',
-        'street', 'city', 'state', 'postcode', 'country', 'lon', 'lat', 'raw'
-    ]
-
-    print(f"\nImporting in batches of {BATCH_SIZE}...")
-
-    # Execute query and fetch in batches
-    result = con.execute(query)
-
-    imported = 0
-    errors = 0
-    error_samples = []
-
-    with tqdm(total=total, desc="Importing", unit="pois") as pbar:
-        while True:
-            rows = result.fetchmany(BATCH_SIZE)
-            if not rows:
-                break
-
-            batch = []
-            for row in rows:
-                try:
-                    record = transform_record(row, columns)
-                    batch.append(record)
-                except Exception as e:
-                    errors += 1
-                    if len(error_samples) < 5:
-                        error_samples.append(f"Transform error: {e}")
-
-            if batch:
-                try:
-                    # Upsert batch - inserts new records, updates existing
-                    supabase.table('places').upsert(
-                        batch,
-                        on_conflict='id'
-                    ).execute()
-                    imported += len(batch)
-                except Exception as e:
-                    # Try one by one on batch failure
-                    for record in batch:
-                        try:
-                            supabase.table('places').upsert(
-                                record,
-                                on_conflict='id'
-                            ).execute()
-                            imported += 1
-                        except Exception as e2:
-                            errors += 1
-                            if len(error_samples) < 5:
-                                error_samples.append(f"Insert error for {record.get('id', '?')}: {e2}")
-
-            pbar.update(len(rows))
+    if args.workers > 1:
+        # Workers build their own queries, one per shard of files
+        print(f"\nImporting in batches of {BATCH_SIZE} across {args.workers} workers...")
+        imported, errors, error_samples = import_parallel(con, args.workers, args.category, args.state)
+    else:
+        # Build query
+        query, params = build_query(
+            limit=args.limit,
+            category=args.category,
+            state=args.state
+        )
+
+        if args.direct:
+            print("\nUpserting directly through DuckDB's postgres extension...")
+            imported = import_direct(con, query, params)
+            errors, error_samples = 0, []
+        else:
+            print(f"\nImporting in batches of {BATCH_SIZE}...")
+            imported, errors, error_samples = import_batches(db_conn, con, query, params, total)
+            db_conn.close()
 
     print(f"\n{'=' * 60}")
     print("Import complete!")